@@ -777,27 +777,37 @@ pub async fn handle_claude_output(
 mod tests {
     use super::*;
     use std::fs;
+    use std::io::Write;
+    use std::path::PathBuf;
 
     use tempfile::TempDir;
 
+    /// Install the python mock script into `dir`, created executable on Unix
+    /// so it doesn't need a separate chmod
+    fn install_mock_claude(dir: &Path) -> PathBuf {
+        let python_script = include_str!("../tests/helpers/mock_claude.py");
+        let mock_path = dir.join("mock_claude.py");
+        let mut options = fs::OpenOptions::new();
+        options.write(true).create_new(true);
+        #[cfg(unix)]
+        {
+            use std::os::unix::fs::OpenOptionsExt;
+            options.mode(0o755);
+        }
+        options
+            .open(&mock_path)
+            .and_then(|mut file| file.write_all(python_script.as_bytes()))
+            .unwrap();
+        mock_path
+    }
+
     #[tokio::test]
     async fn test_spawn_claude_process() {
         let temp_dir = TempDir::new().unwrap();
         let working_dir = temp_dir.path().join("work");
         fs::create_dir_all(&working_dir).unwrap();
 
-        // Create python mock script inline
-        let python_script = include_str!("../tests/helpers/mock_claude.py");
-        let mock_path = temp_dir.path().join("mock_claude.py");
-        fs::write(&mock_path, python_script).unwrap();
-
-        #[cfg(unix)]
-        {
-            use std::os::unix::fs::PermissionsExt;
-            let mut perms = fs::metadata(&mock_path).unwrap().permissions();
-            perms.set_mode(0o755);
-            fs::set_permissions(&mock_path, perms).unwrap();
-        }
+        let mock_path = install_mock_claude(temp_dir.path());
 
         let projects_dir = temp_dir.path().join("projects");
         fs::create_dir_all(&projects_dir).unwrap();
@@ -921,18 +931,7 @@ done
         let working_dir = temp_dir.path().join("work");
         fs::create_dir_all(&working_dir).unwrap();
 
-        // Create python mock script inline
-        let python_script = include_str!("../tests/helpers/mock_claude.py");
-        let mock_path = temp_dir.path().join("mock_claude.py");
-        fs::write(&mock_path, python_script).unwrap();
-
-        #[cfg(unix)]
-        {
-            use std::os::unix::fs::PermissionsExt;
-            let mut perms = fs::metadata(&mock_path).unwrap().permissions();
-            perms.set_mode(0o755);
-            fs::set_permissions(&mock_path, perms).unwrap();
-        }
+        let mock_path = install_mock_claude(temp_dir.path());
 
         let projects_dir = temp_dir.path().join("projects");
         fs::create_dir_all(&projects_dir).unwrap();
@@ -994,18 +993,7 @@ done
         let working_dir = temp_dir.path().join("work");
         fs::create_dir_all(&working_dir).unwrap();
 
-        // Create python mock script inline
-        let python_script = include_str!("../tests/helpers/mock_claude.py");
-        let mock_path = temp_dir.path().join("mock_claude.py");
-        fs::write(&mock_path, python_script).unwrap();
-
-        #[cfg(unix)]
-        {
-            use std::os::unix::fs::PermissionsExt;
-            let mut perms = fs::metadata(&mock_path).unwrap().permissions();
-            perms.set_mode(0o755);
-            fs::set_permissions(&mock_path, perms).unwrap();
-        }
+        let mock_path = install_mock_claude(temp_dir.path());
 
         let projects_dir = temp_dir.path().join("projects");
         fs::create_dir_all(&projects_dir).unwrap();
@@ -71,8 +71,6 @@ impl TestServer {
             axum::serve(listener, app).await.unwrap();
         });
 
-        tokio::time::sleep(Duration::from_millis(100)).await;
-
         TestServer {
             base_url,
             ws_url,
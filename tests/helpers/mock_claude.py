@@ -1,4 +1,4 @@
-#!/usr/bin/env python3
+#!/usr/bin/env -S python3 -I -S
 """
 Minimal mock Claude binary for testing.
 
@@ -13,59 +13,118 @@ import sys
 import json
 import time
 import os
-from pathlib import Path
 
 
-def main():
-    while True:
+# Replies queued by write_json() until flush_output() sends them in one write
+pending_output = []
+
+
+def write_json(data):
+    pending_output.append(json.dumps(data).encode() + b"\n")
+
+
+def flush_output():
+    # A single joined buffer rather than writev(), which is capped at IOV_MAX
+    # (1024) entries and a burst of short messages can exceed that
+    data = b"".join(pending_output)
+    pending_output.clear()
+    while data:
+        written = os.write(sys.stdout.fileno(), data)
+        data = data[written:]
+
+
+def handle_exit(data):
+    sys.exit(data.get("code", 1))
+
+
+def handle_sleep(data):
+    # Don't hold earlier replies back for the whole sleep
+    flush_output()
+    time.sleep(data.get("duration", 1.0))
+
+
+def handle_write_file(data):
+    file_path = data.get("path")
+    content = data.get("content", "")
+    if file_path:
         try:
-            line = sys.stdin.readline()
-            if not line:
-                break
-            
-            line = line.strip()
-            
-            try:
-                data = json.loads(line)
-                
-                # Check for control commands
-                if isinstance(data, dict) and "control" in data:
-                    control = data["control"]
-                    
-                    if control == "exit":
-                        code = data.get("code", 1)
-                        sys.exit(code)
-                    
-                    elif control == "sleep":
-                        duration = data.get("duration", 1.0)
-                        time.sleep(duration)
-                        continue
-                    
-                    elif control == "write_file":
-                        file_path = data.get("path")
-                        content = data.get("content", "")
-                        if file_path:
-                            try:
-                                # Create parent directories if needed
-                                Path(file_path).parent.mkdir(parents=True, exist_ok=True)
-                                with open(file_path, 'w') as f:
-                                    f.write(content)
-                            except Exception as e:
-                                print(json.dumps({"error": f"Failed to write file: {e}"}), flush=True)
-                        continue
-                
-                # Echo back the JSON
-                print(json.dumps(data), flush=True)
-                
-            except json.JSONDecodeError:
-                # Should not happen as backend validates JSON, but just in case
-                print(json.dumps({"error": "Invalid JSON", "input": line}), flush=True)
-                
-        except KeyboardInterrupt:
-            break
+            # Create parent directories if needed
+            parent_dir = os.path.dirname(file_path)
+            if parent_dir:
+                os.makedirs(parent_dir, exist_ok=True)
+            with open(file_path, 'w') as f:
+                f.write(content)
         except Exception as e:
-            # Log error but continue
-            print(json.dumps({"error": str(e)}), flush=True)
+            write_json({"error": f"Failed to write file: {e}"})
+
+
+# Control commands by name; anything else is echoed back like a normal message
+CONTROL_HANDLERS = {
+    "exit": handle_exit,
+    "sleep": handle_sleep,
+    "write_file": handle_write_file,
+}
+
+
+def read_batches():
+    """Yield the complete lines delivered by each read from stdin."""
+    # Pieces of a line still waiting for its newline; only each new chunk is
+    # scanned, so a line spanning many reads stays linear in its length
+    partial = []
+    while True:
+        chunk = os.read(sys.stdin.fileno(), 65536)
+        if not chunk:
+            break
+        if b"\n" not in chunk:
+            partial.append(chunk)
+            continue
+        first, *lines, rest = chunk.split(b"\n")
+        partial.append(first)
+        complete = [b"".join(partial), *lines]
+        partial = [rest] if rest else []
+        yield complete
+    if partial:
+        yield [b"".join(partial)]
+
+
+def handle_line(line):
+    line = line.strip()
+    
+    try:
+        data = json.loads(line)
+        
+        # Check for control commands
+        if isinstance(data, dict) and isinstance(data.get("control"), str):
+            handler = CONTROL_HANDLERS.get(data["control"])
+            if handler:
+                handler(data)
+                return
+        
+        # Echo back the JSON
+        write_json(data)
+        
+    except json.JSONDecodeError:
+        # Should not happen as backend validates JSON, but just in case
+        write_json({"error": "Invalid JSON", "input": line.decode(errors="replace")})
+        
+    except Exception as e:
+        # Log error but continue
+        write_json({"error": str(e)})
+
+
+def main():
+    try:
+        # Answer everything that arrived in one read with a single write, so a
+        # burst of messages costs one syscall each way instead of one per line
+        for lines in read_batches():
+            for line in lines:
+                handle_line(line)
+            flush_output()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Also covers sys.exit() from the exit control command
+        flush_output()
 
 
 if __name__ == "__main__":
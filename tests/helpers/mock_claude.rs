@@ -1,5 +1,6 @@
 use std::env;
 use std::fs;
+use std::io::Write;
 use std::path::{Path, PathBuf};
 use tempfile::TempDir;
 
@@ -15,18 +16,20 @@ impl MockClaude {
         let binary_path = temp_dir.path().join("mock_claude.py");
         let projects_dir = temp_dir.path().join("projects");
 
-        // Copy the Python mock script to the temp directory
+        // Copy the Python mock script to the temp directory, creating it
+        // executable on Unix systems so it doesn't need a separate chmod
         let python_script = include_str!("mock_claude.py");
-        fs::write(&binary_path, python_script).expect("Failed to write mock Claude script");
-
-        // Make the script executable on Unix systems
+        let mut options = fs::OpenOptions::new();
+        options.write(true).create_new(true);
         #[cfg(unix)]
         {
-            use std::os::unix::fs::PermissionsExt;
-            let mut perms = fs::metadata(&binary_path).unwrap().permissions();
-            perms.set_mode(0o755);
-            fs::set_permissions(&binary_path, perms).unwrap();
+            use std::os::unix::fs::OpenOptionsExt;
+            options.mode(0o755);
         }
+        options
+            .open(&binary_path)
+            .and_then(|mut file| file.write_all(python_script.as_bytes()))
+            .expect("Failed to write mock Claude script");
 
         // Ensure file is fully written and synced to disk
         std::thread::sleep(std::time::Duration::from_millis(5));
@@ -63,7 +66,7 @@ impl MockClaude {
 #[cfg(test)]
 mod tests {
     use super::*;
-    use std::io::Write;
+    use std::io::{BufRead, BufReader, Read, Write};
     use std::process::{Command, Stdio};
 
     #[test]
@@ -107,10 +110,57 @@ mod tests {
     }
 
     #[test]
-    fn test_mock_claude_exit_control() {
+    fn test_mock_claude_batched_and_split_lines() {
+        let mock = MockClaude::new();
+
+        let mut child = Command::new("python3")
+            .arg(&mock.binary_path)
+            .stdin(Stdio::piped())
+            .stdout(Stdio::piped())
+            .spawn()
+            .expect("Failed to start mock Claude");
+
+        // Several messages and the first half of another in one write. It is
+        // below PIPE_BUF, so the mock gets it in a single read: every complete
+        // message must get a reply, and the unfinished one must be held back
+        let mut stdin = child.stdin.take().expect("Failed to open stdin");
+        let mut batch = Vec::new();
+        for i in 0..50 {
+            writeln!(batch, "{{\"seq\": {i}}}").unwrap();
+        }
+        batch.extend_from_slice(br#"{"split": "#);
+        stdin.write_all(&batch).expect("Failed to write batch");
+
+        // Reading all 50 replies proves that read was handled, so the rest of
+        // the split message is guaranteed to arrive in a later read
+        let mut stdout = BufReader::new(child.stdout.take().expect("Failed to open stdout"));
+        let mut line = String::new();
+        for i in 0..50 {
+            line.clear();
+            stdout.read_line(&mut line).expect("Failed to read reply");
+            assert_eq!(line, format!("{{\"seq\": {i}}}\n"));
+        }
+
+        stdin
+            .write_all(b"\"done\"}\n")
+            .expect("Failed to write second half");
+        drop(stdin);
+
+        let mut rest = String::new();
+        stdout
+            .read_to_string(&mut rest)
+            .expect("Failed to read output");
+        assert_eq!(rest, "{\"split\": \"done\"}\n");
+
+        let status = child.wait().expect("Failed to wait for mock Claude");
+        assert_eq!(status.code(), Some(0));
+    }
+
+    #[test]
+    fn test_mock_claude_unknown_control_is_echoed() {
         let mock = MockClaude::new();
 
-        // Test exit with code 1
+        // Unknown control commands are not dispatched and fall through to echo
         let mut child = Command::new("python3")
             .arg(&mock.binary_path)
             .stdin(Stdio::piped())
@@ -118,6 +168,32 @@ mod tests {
             .spawn()
             .expect("Failed to start mock Claude");
 
+        let stdin = child.stdin.as_mut().expect("Failed to open stdin");
+        let unknown_json = r#"{"control": "not_a_command"}"#;
+        stdin
+            .write_all(unknown_json.as_bytes())
+            .expect("Failed to write unknown control");
+        stdin.write_all(b"\n").expect("Failed to write newline");
+
+        let output = child.wait_with_output().expect("Failed to read output");
+        assert_eq!(output.status.code(), Some(0));
+
+        let stdout = String::from_utf8(output.stdout).unwrap();
+        assert!(stdout.contains(unknown_json));
+    }
+
+    #[test]
+    fn test_mock_claude_exit_control() {
+        let mock = MockClaude::new();
+
+        // Test exit with code 1; only the exit status is checked, so drop stdout
+        let mut child = Command::new("python3")
+            .arg(&mock.binary_path)
+            .stdin(Stdio::piped())
+            .stdout(Stdio::null())
+            .spawn()
+            .expect("Failed to start mock Claude");
+
         let stdin = child.stdin.as_mut().expect("Failed to open stdin");
         let exit_json = r#"{"control": "exit", "code": 42}"#;
         stdin
@@ -125,8 +201,8 @@ mod tests {
             .expect("Failed to write exit command");
         stdin.write_all(b"\n").expect("Failed to write newline");
 
-        let output = child.wait_with_output().expect("Failed to read output");
-        assert_eq!(output.status.code(), Some(42));
+        let status = child.wait().expect("Failed to wait for mock Claude");
+        assert_eq!(status.code(), Some(42));
     }
 
     #[test]
@@ -134,11 +210,11 @@ mod tests {
         let mock = MockClaude::new();
         let test_file = mock.temp_dir.path().join("test_output.txt");
 
-        // Test write_file control command
+        // Test write_file control command; the result is checked on disk, not stdout
         let mut child = Command::new("python3")
             .arg(&mock.binary_path)
             .stdin(Stdio::piped())
-            .stdout(Stdio::piped())
+            .stdout(Stdio::null())
             .spawn()
             .expect("Failed to start mock Claude");
 
@@ -161,7 +237,7 @@ mod tests {
             .expect("Failed to write exit command");
         stdin.write_all(b"\n").expect("Failed to write newline");
 
-        let _output = child.wait_with_output().expect("Failed to read output");
+        let _status = child.wait().expect("Failed to wait for mock Claude");
 
         // Check that file was created
         assert!(test_file.exists());
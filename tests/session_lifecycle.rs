@@ -101,9 +101,6 @@ impl TestServer {
             axum::serve(listener, app).await.unwrap();
         });
 
-        // Give server time to start - increase for better test isolation
-        tokio::time::sleep(Duration::from_millis(500)).await;
-
         TestServer {
             base_url,
             ws_url,
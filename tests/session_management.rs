@@ -99,9 +99,6 @@ impl TestServer {
             axum::serve(listener, app).await.unwrap();
         });
 
-        // Give server time to start - increase for better test isolation
-        tokio::time::sleep(Duration::from_millis(500)).await;
-
         Self {
             base_url,
             mock,
@@ -101,9 +101,6 @@ impl TestServer {
             axum::serve(listener, app).await.unwrap();
         });
 
-        // Give server time to start
-        tokio::time::sleep(Duration::from_millis(500)).await;
-
         Self {
             base_url,
             mock,